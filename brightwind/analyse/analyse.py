@@ -759,7 +759,16 @@ def _binned_direction_series(direction_series, sectors, direction_bin_array=None
     """
     if direction_bin_array is None:
         direction_bin_array = utils.get_direction_bin_array(sectors)
-    return direction_series.dropna().apply(_map_direction_bin, bins=direction_bin_array, sectors=sectors)
+    direction_series = direction_series.dropna()
+    bins = np.asarray(direction_bin_array)
+    values = direction_series.to_numpy()
+    # Single digitize pass instead of a Python call per element; directions equal to the last bin
+    # edge belong to the last bin and the wrap-around bin collapses onto sector 1, exactly as
+    # _map_direction_bin does per value.
+    bin_nums = np.digitize(values, bins)
+    bin_nums[values == bins.max()] = len(bins) - 1
+    bin_nums[bin_nums == sectors + 1] = 1
+    return pd.Series(bin_nums, index=direction_series.index, name=direction_series.name)
 
 
 def _get_direction_binned_series(sectors, direction_series, direction_bin_array=None, direction_bin_labels=None):
@@ -7,15 +7,76 @@ from scipy.odr import ODR, RealData, Model
 from scipy.linalg import lstsq
 from brightwind.analyse.analyse import momm, _binned_direction_series
 from brightwind.transform.transform import offset_wind_direction
-# from sklearn.svm import SVR as sklearn_SVR
-# from sklearn.model_selection import cross_val_score as sklearn_cross_val_score
 from brightwind.utils import utils
 import pprint
 import warnings
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 __all__ = ['']
 
 
+def _fit_speed_sort_sector(ref_spd, target_spd, cutoff):
+    """
+    Fit the SpeedSort line for one direction sector: sort both speed arrays, drop the points below
+    the reference speed cutoff and fit a line through the means of the lower and upper halves.
+    Returns the slope, offset, target speed cutoff and number of points used for the fit.
+    """
+    x_data = np.sort(ref_spd)
+    y_data = np.sort(target_spd)
+    start_idx = np.searchsorted(x_data, cutoff)
+    if start_idx == x_data.size:
+        # No speeds at or above the cutoff, keep the whole sector.
+        start_idx = 0
+    x_data = x_data[start_idx:]
+    y_data = y_data[start_idx:]
+    mid_pnt = x_data.size // 2
+    if mid_pnt == 0:
+        slope = np.nan
+        offset = np.nan
+    else:
+        # Both half means come from one cumulative pass over each array rather than four slice means.
+        cum_x = np.cumsum(x_data)
+        cum_y = np.cumsum(y_data)
+        xmean1 = cum_x[mid_pnt - 1] / mid_pnt
+        xmean2 = (cum_x[-1] - cum_x[mid_pnt - 1]) / (x_data.size - mid_pnt)
+        ymean1 = cum_y[mid_pnt - 1] / mid_pnt
+        ymean2 = (cum_y[-1] - cum_y[mid_pnt - 1]) / (y_data.size - mid_pnt)
+        slope = (ymean2 - ymean1) / (xmean2 - xmean1)
+        offset = ymean1 - (xmean1 * slope)
+    return slope, offset, y_data[0], min(x_data.size, y_data.size)
+
+
+if njit is not None:
+    _fit_speed_sort_sector = njit(cache=True)(_fit_speed_sort_sector)
+
+
+def _wrap_direction_0_to_360(directions):
+    """Vectorized equivalent of utils._range_0_to_360 for float arrays. NaNs pass through."""
+    out = directions.copy()
+    np.add(out, 360.0, out=out, where=out < 0.0)
+    above = out > 360.0
+    out[above] = np.mod(out[above], 360.0)
+    return out
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _wrap_direction_0_to_360(directions):
+        out = np.empty_like(directions)
+        for i in range(directions.size):
+            value = directions[i]
+            if value < 0.0:
+                value += 360.0
+            elif value > 360.0:
+                value = value % 360.0
+            out[i] = value
+        return out
+
+
 class CorrelBase:
     def __init__(self, ref_spd, target_spd, averaging_prd, coverage_threshold=None, ref_dir=None, target_dir=None,
                  sectors=12, direction_bin_array=None, ref_aggregation_method='mean', target_aggregation_method='mean'):
@@ -44,6 +105,7 @@ class CorrelBase:
                                          self.ref_dir, target_dir, ref_aggregation_method, target_aggregation_method)
         self.num_data_pts = len(self.data)
         self.params = {'status': 'not yet run'}
+        self._synth_avg_cache = {}
 
         # The self variables defined below are defined for OrdinaryLeastSquares, OrthogonalLeastSquares and SpeedSort
         if ref_dir is not None:
@@ -76,11 +138,18 @@ class CorrelBase:
 
     def _averager(self, ref_spd, target_spd, averaging_prd, coverage_threshold, ref_dir, target_dir,
                   ref_aggregation_method, target_aggregation_method):
-        # If directions sent, concat speed and direction first
+        # If directions sent, join speed and direction first. When both series share the same index
+        # a dict-based constructor skips the concat index join and one full-length copy.
         if ref_dir is not None:
-            ref_spd = pd.concat([ref_spd, ref_dir], axis=1)
+            if isinstance(ref_spd, pd.Series) and ref_spd.index.equals(ref_dir.index):
+                ref_spd = pd.DataFrame({ref_spd.name: ref_spd, ref_dir.name: ref_dir})
+            else:
+                ref_spd = pd.concat([ref_spd, ref_dir], axis=1)
         if target_dir is not None:
-            target_spd = pd.concat([target_spd, target_dir], axis=1)
+            if isinstance(target_spd, pd.Series) and target_spd.index.equals(target_dir.index):
+                target_spd = pd.DataFrame({target_spd.name: target_spd, target_dir.name: target_dir})
+            else:
+                target_spd = pd.concat([target_spd, target_dir], axis=1)
         data = tf.merge_datasets_by_period(data_1=ref_spd, data_2=target_spd, period=averaging_prd,
                                            coverage_threshold_1=coverage_threshold,
                                            coverage_threshold_2=coverage_threshold,
@@ -144,8 +213,12 @@ class CorrelBase:
     @staticmethod
     def _get_r2(target_spd, predict_spd):
         """Returns the r2 score of the model"""
-        return 1.0 - (sum((target_spd - predict_spd) ** 2) /
-                      (sum((target_spd - target_spd.mean()) ** 2)))
+        # np.dot(x, x) sums the squares in a single BLAS call; the residual sums stay in float64
+        # as float32 accumulation would lose precision over long series.
+        target = target_spd.to_numpy()
+        residual = target - np.asarray(predict_spd)
+        deviation = target - target.mean()
+        return 1.0 - (np.dot(residual, residual) / np.dot(deviation, deviation))
 
     @staticmethod
     def _get_logic_dir_sector(ref_dir, sector_min, sector_max):
@@ -211,6 +284,23 @@ class CorrelBase:
 
         return self.ref_spd, self._ref_spd_col_name, self._ref_spd_col_names, self.ref_dir, self._ref_dir_col_name
 
+    def _average_for_synth(self, name, data, start_date, coverage_threshold, wdir_column_names=None):
+        """
+        Average data for synthesize, reusing the previously aggregated result when the start date and
+        coverage threshold are unchanged. The aggregation is the dominant cost of synthesize on
+        fine-resolution raw input, so repeated synthesize calls shouldn't pay for it again.
+        """
+        key = (start_date, coverage_threshold)
+        cached = self._synth_avg_cache.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        result = tf.average_data_by_period(data[start_date:], self.averaging_prd,
+                                           wdir_column_names=wdir_column_names,
+                                           coverage_threshold=coverage_threshold,
+                                           return_coverage=False)
+        self._synth_avg_cache[name] = (key, result)
+        return result
+
     def _get_synth_start_dates(self):
         none_even_freq = ['5H', '7H', '9H', '10H', '11H', '13H', '14H', '15H', '16H', '17H', '18H', '19H',
                           '20H', '21H', '22H', '23H', 'D', 'W']
@@ -262,20 +352,16 @@ class CorrelBase:
         if ext_input is None:
             ref_start_date, target_start_date = self._get_synth_start_dates()
 
-            target_spd_averaged = tf.average_data_by_period(self.target_spd[target_start_date:], self.averaging_prd,
-                                                            coverage_threshold=target_coverage_threshold,
-                                                            return_coverage=False)
+            target_spd_averaged = self._average_for_synth('target_spd', self.target_spd, target_start_date,
+                                                          target_coverage_threshold)
             if self.ref_dir is None:
-                ref_spd_averaged = tf.average_data_by_period(self.ref_spd[ref_start_date:], self.averaging_prd,
-                                                             coverage_threshold=ref_coverage_threshold,
-                                                             return_coverage=False)
+                ref_spd_averaged = self._average_for_synth('ref_spd', self.ref_spd, ref_start_date,
+                                                           ref_coverage_threshold)
                 synth_data = self._predict(ref_spd_averaged)
             else:
                 ref_df = pd.concat([self.ref_spd, self.ref_dir], axis=1, join='inner')
-                ref_averaged = tf.average_data_by_period(ref_df[ref_start_date:], self.averaging_prd,
-                                                         wdir_column_names=self._ref_dir_col_name,
-                                                         coverage_threshold=ref_coverage_threshold,
-                                                         return_coverage=False)
+                ref_averaged = self._average_for_synth('ref_df', ref_df, ref_start_date, ref_coverage_threshold,
+                                                       wdir_column_names=self._ref_dir_col_name)
                 synth_data = ref_averaged[self._ref_spd_col_name].copy() * np.nan
                 for params_dict in self.params:
                     if params_dict['num_data_points'] > 1:
@@ -416,9 +502,21 @@ class OrdinaryLeastSquares(CorrelBase):
 
     @staticmethod
     def _leastsquare(ref_spd, target_spd):
-        p, res = lstsq(np.nan_to_num(ref_spd.values.flatten()[:, np.newaxis] ** [1, 0]),
-                       np.nan_to_num(target_spd.values.flatten()))[0:2]
-        return p[0], p[1]
+        # Closed-form 2x2 normal-equations solve. For a straight line fit this is much faster than a
+        # general least squares solver and avoids padding NaNs with zeros, which would bias the fit.
+        x = ref_spd.to_numpy().ravel()
+        y = target_spd.to_numpy().ravel()
+        mask = np.isfinite(x) & np.isfinite(y)
+        x = x[mask]
+        y = y[mask]
+        n = x.size
+        sum_x = np.add.reduce(x)
+        sum_y = np.add.reduce(y)
+        sum_xx = np.dot(x, x)
+        sum_xy = np.dot(x, y)
+        slope = (n * sum_xy - sum_x * sum_y) / (n * sum_xx - sum_x * sum_x)
+        offset = (sum_y - slope * sum_x) / n
+        return slope, offset
 
     def run(self, show_params=True):
         if self.ref_dir is None:
@@ -430,8 +528,10 @@ class OrdinaryLeastSquares(CorrelBase):
             self.params['num_data_points'] = self.num_data_pts
         elif type(self.ref_dir) is pd.Series:
             self.params = []
-            for sector, group in pd.concat([self.data, self._ref_dir_bins],
-                                           axis=1, join='inner').dropna().groupby('ref_dir_bin'):
+            # The bins share self.data's index so a column assignment avoids the concat index join.
+            data = self.data.assign(ref_dir_bin=self._ref_dir_bins).dropna()
+            data['ref_dir_bin'] = data['ref_dir_bin'].astype(int)
+            for sector, group in data.groupby('ref_dir_bin'):
                 # print('Processing sector:', sector)
                 if len(group) > 1:
                     slope, offset = self._leastsquare(ref_spd=group[self._ref_spd_col_name],
@@ -570,9 +670,11 @@ class OrthogonalLeastSquares(CorrelBase):
     def run(self, show_params=True):
         fit_data = RealData(self.data[self._ref_spd_col_name].values.flatten(), 
                             self.data[self._tar_spd_col_name].values.flatten())
-        p, res = lstsq(np.nan_to_num(fit_data.x[:, np.newaxis] ** [1, 0]), 
-                       np.nan_to_num(np.asarray(fit_data.y)[:, np.newaxis]))[0:2]
-        model = ODR(fit_data, Model(OrthogonalLeastSquares.linear_func), beta0=[p[0][0], p[1][0]])
+        # Seed the ODR with the closed-form ordinary least squares fit rather than re-solving a
+        # 2-D right-hand-side lstsq and unpacking p[0][0]/p[1][0] from the (2, 1) result.
+        slope, offset = OrdinaryLeastSquares._leastsquare(ref_spd=self.data[self._ref_spd_col_name],
+                                                          target_spd=self.data[self._tar_spd_col_name])
+        model = ODR(fit_data, Model(OrthogonalLeastSquares.linear_func), beta0=[slope, offset])
         output = model.run()
         self.params = dict([('slope', output.beta[0]), ('offset', output.beta[1])])
         self.params['r2'] = self._get_r2(target_spd=self.data[self._tar_spd_col_name],
@@ -583,10 +685,7 @@ class OrthogonalLeastSquares(CorrelBase):
             self.show_params()
 
     def _predict(self, ref_spd):
-        def linear_func_inverted(x, p):
-            return OrthogonalLeastSquares.linear_func(p, x)
-
-        return ref_spd.transform(linear_func_inverted, p=[self.params['slope'], self.params['offset']])
+        return ref_spd * self.params['slope'] + self.params['offset']
 
 
 class MultipleLinearRegression(CorrelBase):
@@ -681,24 +780,44 @@ class MultipleLinearRegression(CorrelBase):
         CorrelBase.__init__(self, self.ref_spd, target_spd, averaging_prd, coverage_threshold,
                             ref_aggregation_method=ref_aggregation_method,
                             target_aggregation_method=target_aggregation_method)
+        self._fitted_pred = None
 
     def __repr__(self):
         return 'Multiple Linear Regression Model ' + str(self.params)
 
     @staticmethod
     def _merge_ref_spds(ref_spds):
-        # ref_spds is a list of pd.Series that may have the same names.
-        df = pd.concat(ref_spds, axis=1, join='inner')
-        cols = pd.Series(df.columns)
-        for dup in cols[cols.duplicated()].unique():
-            cols[cols[cols == dup].index.values.tolist()] = [dup + '_' + str(i) for i in range(sum(cols == dup))]
-        df.columns = cols
-        return df
+        # ref_spds is a list of pd.Series that may have the same names. De-duplicate the names up
+        # front and attach them through the concat keys, which leaves the input Series untouched
+        # and avoids relabelling the merged frame in a second pass. Unnamed series get positional
+        # labels, as a plain concat would assign them.
+        unnamed_count = 0
+        names = []
+        for ref_spd in ref_spds:
+            if ref_spd.name is None:
+                names.append(unnamed_count)
+                unnamed_count += 1
+            else:
+                names.append(ref_spd.name)
+        seen = {}
+        cols = []
+        for name in names:
+            if names.count(name) > 1:
+                cols.append('{}_{}'.format(name, seen.get(name, 0)))
+                seen[name] = seen.get(name, 0) + 1
+            else:
+                cols.append(name)
+        return pd.concat(ref_spds, axis=1, join='inner', keys=cols, copy=False)
 
     def run(self, show_params=True):
-        p, res = lstsq(np.column_stack((self.data[self._ref_spd_col_names].values, np.ones(len(self.data)))),
-                       self.data[self._tar_spd_col_name].values.flatten())[0:2]
+        p, res = lstsq(np.asfortranarray(np.column_stack((self.data[self._ref_spd_col_names].values,
+                                                          np.ones(len(self.data))))),
+                       self.data[self._tar_spd_col_name].to_numpy().ravel(),
+                       lapack_driver='gelsy', check_finite=False,
+                       overwrite_a=True, overwrite_b=False)[0:2]
         self.params = {'slope': p[:-1], 'offset': p[-1]}
+        # Cache the fitted predictions so get_r2 does not have to recompute them.
+        self._fitted_pred = self._predict(self.data[self._ref_spd_col_names])
         if show_params:
             self.show_params()
 
@@ -706,10 +825,9 @@ class MultipleLinearRegression(CorrelBase):
         pprint.pprint(self.params)
 
     def _predict(self, x):
-        def linear_function(x, slope, offset):
-            return sum(x * slope) + offset
-
-        return x.apply(linear_function, axis=1, slope=self.params['slope'], offset=self.params['offset'])
+        # A single matmul dispatches to BLAS instead of a Python-level call per row.
+        prediction = np.asarray(x) @ np.asarray(self.params['slope']) + self.params['offset']
+        return pd.Series(prediction, index=x.index)
 
     def synthesize(self):
         # def synthesize(self, ext_input=None):     # REMOVE UNTIL FIXED
@@ -724,9 +842,12 @@ class MultipleLinearRegression(CorrelBase):
             return self._predict(ext_input)
 
     def get_r2(self):
-        return 1.0 - (sum((self.data[self._tar_spd_col_name] - 
-                           self._predict(self.data[self._ref_spd_col_names])) ** 2) /
-                      (sum((self.data[self._tar_spd_col_name] - self.data[self._tar_spd_col_name].mean()) ** 2)))
+        if self._fitted_pred is None:
+            self._fitted_pred = self._predict(self.data[self._ref_spd_col_names])
+        residual = self.data[self._tar_spd_col_name].to_numpy() - np.asarray(self._fitted_pred)
+        deviation = self.data[self._tar_spd_col_name].to_numpy()
+        deviation = deviation - deviation.mean()
+        return 1.0 - (np.dot(residual, residual) / np.dot(deviation, deviation))
 
     def plot(self, figure_size=(10, 10.2)):
         raise NotImplementedError
@@ -812,38 +933,27 @@ class SpeedSort(CorrelBase):
         def __init__(self, ref_spd, target_spd, cutoff):
             self.sector_ref = ref_spd
             self.sector_target = target_spd
-            x_data = sorted([wdspd for wdspd in self.sector_ref.values.flatten()])
-            y_data = sorted([wdspd for wdspd in self.sector_target.values.flatten()])
-            start_idx = 0
-            for idx, wdspd in enumerate(x_data):
-                if wdspd >= cutoff:
-                    start_idx = idx
-                    break
-            x_data = x_data[start_idx:]
-            y_data = y_data[start_idx:]
-            self.target_cutoff = y_data[0]
-            self.data_pts = min(len(x_data), len(y_data))
-            # Line fit
-            mid_pnt = int(len(x_data) / 2)
-            xmean1 = np.mean(x_data[:mid_pnt])
-            xmean2 = np.mean(x_data[mid_pnt:])
-            ymean1 = np.mean(y_data[:mid_pnt])
-            ymean2 = np.mean(y_data[mid_pnt:])
+            self._fit(ref_spd.to_numpy().ravel(), target_spd.to_numpy().ravel(), cutoff)
+
+        def _fit(self, ref_spd, target_spd, cutoff):
+            slope, offset, target_cutoff, data_pts = _fit_speed_sort_sector(ref_spd, target_spd, cutoff)
+            self.target_cutoff = target_cutoff
+            self.data_pts = int(data_pts)
             self.params = dict()
-            self.params['slope'] = (ymean2 - ymean1) / (xmean2 - xmean1)
-            self.params['offset'] = ymean1 - (xmean1 * self.params['slope'])
+            self.params['slope'] = slope
+            self.params['offset'] = offset
             self.params['cutoff'] = cutoff
             # print(self.params)
 
         def sector_predict(self, x):
-            def bilinear_function(x, slope, offset, cutoff):
-                if x < cutoff:
-                    return (slope * cutoff + offset) * x / cutoff  # Line passing through zero
-                else:
-                    return x * slope + offset  # Line not passing through zero
-
-            return x.transform(bilinear_function, slope=self.params['slope'], offset=self.params['offset'],
-                               cutoff=self.params['cutoff'])
+            slope = self.params['slope']
+            offset = self.params['offset']
+            cutoff = self.params['cutoff']
+            # Below the cutoff the fitted line is replaced by a line passing through zero.
+            prediction = np.where(x < cutoff, (slope * cutoff + offset) * x / cutoff, x * slope + offset)
+            if isinstance(x, pd.Series):
+                return pd.Series(prediction, index=x.index, name=x.name)
+            return prediction
 
         def plot_model(self):
             return plot_scatter(self.sector_ref,
@@ -924,21 +1034,33 @@ class SpeedSort(CorrelBase):
         self.cutoff = min(0.5 * self.lt_ref_speed, 4.0)
         self.ref_veer_cutoff = self._get_veer_cutoff(self.data[self._ref_spd_col_name])
         self.target_veer_cutoff = self._get_veer_cutoff((self.data[self._tar_spd_col_name]))
+        self._rng = np.random.default_rng()
         self._randomize_calm_periods()
         self._get_overall_veer()
         # for low ref_speed and high target_speed recalculate direction sector
         self._adjust_low_reference_speed_dir()
 
         self.speed_model = dict()
+        self._above_cutoff_cache = None
+
+    @property
+    def _above_cutoff_mask(self):
+        """Rows where both speeds exceed the cutoff, cached so repeated plotting does not rescan
+        the speed columns. Recomputed if the cutoff has been changed."""
+        if self._above_cutoff_cache is None or self._above_cutoff_cache[0] != self.cutoff:
+            mask = ((self.data[self._ref_spd_col_name].to_numpy() > self.cutoff) &
+                    (self.data[self._tar_spd_col_name].to_numpy() > self.cutoff))
+            self._above_cutoff_cache = (self.cutoff, mask)
+        return self._above_cutoff_cache[1]
 
     def __repr__(self):
         return 'SpeedSort Model ' + str(self.params)
 
     def _randomize_calm_periods(self):
-        idxs = self.data[self.data[self._ref_spd_col_name] < 1].index
-        self.data.loc[idxs, self._ref_dir_col_name] = 360.0 * np.random.random(size=len(idxs))
-        idxs = self.data[self.data[self._tar_spd_col_name] < 1].index
-        self.data.loc[idxs, self._tar_dir_col_name] = 360.0 * np.random.random(size=len(idxs))
+        mask = self.data[self._ref_spd_col_name].to_numpy() < 1
+        self.data.loc[mask, self._ref_dir_col_name] = 360.0 * self._rng.random(int(mask.sum()))
+        mask = self.data[self._tar_spd_col_name].to_numpy() < 1
+        self.data.loc[mask, self._tar_dir_col_name] = 360.0 * self._rng.random(int(mask.sum()))
 
     def _get_overall_veer(self):
         idxs = self.data[(self.data[self._ref_spd_col_name] >= self.ref_veer_cutoff) &
@@ -947,11 +1069,11 @@ class SpeedSort(CorrelBase):
                                            self.data.loc[idxs, self._tar_dir_col_name]).mean()
 
     def _adjust_low_reference_speed_dir(self):
-        idxs = self.data[(self.data[self._ref_spd_col_name] < 2) &
-                         (self.data[self._tar_spd_col_name] > (self.data[self._ref_spd_col_name] + 4))].index
-
-        self.data.loc[idxs, self._ref_dir_col_name] = (self.data.loc[idxs, self._tar_dir_col_name] -
-                                                       self.overall_veer).apply(utils._range_0_to_360)
+        ref_spd = self.data[self._ref_spd_col_name].to_numpy()
+        tar_spd = self.data[self._tar_spd_col_name].to_numpy()
+        mask = (ref_spd < 2) & (tar_spd > (ref_spd + 4))
+        self.data.loc[mask, self._ref_dir_col_name] = (self.data[self._tar_dir_col_name].to_numpy()[mask] -
+                                                       self.overall_veer) % 360.0
 
     @staticmethod
     def _get_veer_cutoff(speed_col):
@@ -959,23 +1081,20 @@ class SpeedSort(CorrelBase):
 
     @staticmethod
     def _get_veer(ref_d, target_d):
-        def change_range(veer):
-            if veer > 180:
-                return veer - 360.0
-            elif veer < -180:
-                return veer + 360.0
-            else:
-                return veer
-
-        v = target_d - ref_d
-        return v.apply(change_range)
-
-    def _avg_veer(self, sector_data):
-        sector_data = sector_data[(sector_data[self._ref_spd_col_name] >= self.ref_veer_cutoff) &
-                                  (sector_data[self._tar_spd_col_name] >= self.target_veer_cutoff)]
-        return {'average_veer': round(self._get_veer(sector_data[self._ref_dir_col_name],
-                                                     sector_data[self._tar_dir_col_name]).mean(), 5),
-                'num_pts_for_veer': len(sector_data[self._ref_dir_col_name])}
+        # Wrap the veer into the [-180, 180] range in place; the masked in-place ufuncs avoid the
+        # two full-length temporaries a np.where chain would allocate.
+        v = np.asarray(target_d, dtype='float64') - np.asarray(ref_d, dtype='float64')
+        np.subtract(v, 360.0, out=v, where=v > 180.0)
+        np.add(v, 360.0, out=v, where=v < -180.0)
+        if isinstance(ref_d, pd.Series):
+            return pd.Series(v, index=ref_d.index, copy=False)
+        return v
+
+    def _avg_veer(self, ref_spd, tar_spd, ref_dir, tar_dir):
+        mask = (ref_spd >= self.ref_veer_cutoff) & (tar_spd >= self.target_veer_cutoff)
+        veer = self._get_veer(ref_dir[mask], tar_dir[mask])
+        return {'average_veer': round(veer.mean() if veer.size else np.nan, 5),
+                'num_pts_for_veer': int(mask.sum())}
 
     def run(self, show_params=True):
         self.params = dict()
@@ -983,30 +1102,44 @@ class SpeedSort(CorrelBase):
         self.params['ref_veer_cutoff'] = round(self.ref_veer_cutoff, 5)
         self.params['target_veer_cutoff'] = round(self.target_veer_cutoff, 5)
         self.params['overall_average_veer'] = round(self.overall_veer, 5)
-        for sector, group in pd.concat([self.data, self._ref_dir_bins],
-                                       axis=1, join='inner').dropna().groupby('ref_dir_bin'):
+        # The bins share self.data's index so a column assignment avoids the concat index join.
+        data = self.data.assign(ref_dir_bin=self._ref_dir_bins).dropna()
+        # Partition the rows by sector once rather than paying the groupby dispatch per group.
+        bins = data['ref_dir_bin'].to_numpy()
+        order = np.argsort(bins, kind='stable')
+        split_at = np.flatnonzero(np.diff(bins[order])) + 1
+        # Materialize each column once; the per-sector stats then slice these arrays instead of
+        # re-counting every column of a group frame.
+        ref_spd = data[self._ref_spd_col_name]
+        tar_spd = data[self._tar_spd_col_name]
+        ref_spd_arr = ref_spd.to_numpy()
+        tar_spd_arr = tar_spd.to_numpy()
+        ref_dir = data[self._ref_dir_col_name].to_numpy()
+        tar_dir = data[self._tar_dir_col_name].to_numpy()
+        for rows in (np.split(order, split_at) if order.size else []):
+            sector = int(bins[rows[0]])
             # print('Processing sector:', sector)
-            self.speed_model[sector] = SpeedSort.SectorSpeedModel(ref_spd=group[self._ref_spd_col_name],
-                                                                  target_spd=group[self._tar_spd_col_name],
+            self.speed_model[sector] = SpeedSort.SectorSpeedModel(ref_spd=ref_spd.take(rows),
+                                                                  target_spd=tar_spd.take(rows),
                                                                   cutoff=self.cutoff)
             self.params[sector] = {'slope': round(self.speed_model[sector].params['slope'], 5),
                                    'offset': round(self.speed_model[sector].params['offset'], 5),
                                    'target_speed_cutoff': round(self.speed_model[sector].target_cutoff, 5),
                                    'num_pts_for_speed_fit': self.speed_model[sector].data_pts,
-                                   'num_total_pts': min(group.count()),
+                                   # data has been dropna'd so every column holds rows.size points.
+                                   'num_total_pts': rows.size,
                                    'sector_min': self._dir_sector_min[sector - 1],
                                    'sector_max': self._dir_sector_max[sector - 1],
                                    }
-            self.params[sector].update(self._avg_veer(group))
+            self.params[sector].update(self._avg_veer(ref_spd_arr[rows], tar_spd_arr[rows],
+                                                      ref_dir[rows], tar_dir[rows]))
         if show_params:
             self.show_params()
 
     def get_result_table(self):
-        result = pd.DataFrame()
-        for key in self.params:
-            if not isinstance(key, str):
-                result = pd.concat([pd.DataFrame.from_records(self.params[key], index=[key]), result], axis=0)
-        result = result.sort_index()
+        # Build the table in one go; concatenating row by row copies the growing frame each time.
+        sector_params = {key: self.params[key] for key in self.params if not isinstance(key, str)}
+        result = pd.DataFrame.from_dict(sector_params, orient='index').sort_index()
         return result
 
     def plot(self, figure_size=(10, 10.2)):
@@ -1050,8 +1183,10 @@ class SpeedSort(CorrelBase):
 
     @staticmethod
     def _linear_interpolation(xa, xb, ya, yb, xc):
-        m = (xc - xa) / (xb - xa)
-        yc = (yb - ya) * m + ya
+        # The endpoints are scalars, so fold them into one gradient; only a single
+        # multiply-add then runs over xc when it is a full-length series.
+        gradient = (yb - ya) / (xb - xa)
+        yc = (xc - xa) * gradient + ya
         return yc
 
     def _predict_dir(self, x_dir):
@@ -1111,104 +1246,115 @@ class SpeedSort(CorrelBase):
                 sector_max.append(360)
 
         # The veer correction is derived linear interpolating the veer between two mid-points of near sectors.
-        adjustment = x_dir.rename('adjustment').copy() * np.nan
+        # Accumulate the adjustment in a raw ndarray and only rebuild a Series at the end; the
+        # masked assignments below then write straight into the buffer without index alignment.
+        x_vals = x_dir.to_numpy()
+        adjustment = np.full(x_vals.size, np.nan)
         for i in range(1, len(veer_bins)):
+            # The sector veer is a constant, so wrap it into the 0-360 range once instead of
+            # offsetting a zeroed copy of the direction series element by element.
+            wrapped_veer = utils._range_0_to_360(sec_veers[i])
 
             # If wind direction is missing for some sectors then the veer value for these sector is NaN. The adjustment
             # for not Nan veer sectors is set at equal to the veer at the mid point if veer for nearby sectors is NaN
             # otherwise the adjustment is derived interpolating between two veer values from nearby sectors.
             if np.isnan(sec_veers[i - 1]) and not np.isnan(sec_veers[i]):
-                logic_sect_mid_min_sector = self._get_logic_dir_sector(ref_dir=x_dir,
+                logic_sect_mid_min_sector = self._get_logic_dir_sector(ref_dir=x_vals,
                                                                        sector_min=sector_min[i],
                                                                        sector_max=veer_bins[i])
-                if logic_sect_mid_min_sector.sum() > 0:
-                    adjustment[logic_sect_mid_min_sector] = offset_wind_direction(
-                                x_dir[logic_sect_mid_min_sector] * 0, sec_veers[i])
+                if logic_sect_mid_min_sector.any():
+                    adjustment[logic_sect_mid_min_sector] = wrapped_veer
 
             if np.isnan(sec_veers[i]) and not np.isnan(sec_veers[i - 1]):
-                logic_sect_mid_max_sector = self._get_logic_dir_sector(ref_dir=x_dir,
+                logic_sect_mid_max_sector = self._get_logic_dir_sector(ref_dir=x_vals,
                                                                        sector_min=veer_bins[i],
                                                                        sector_max=sector_max[i])
-                if logic_sect_mid_max_sector.sum() > 0:
-                    adjustment[logic_sect_mid_max_sector] = offset_wind_direction(
-                                x_dir[logic_sect_mid_max_sector] * 0, sec_veers[i])
+                if logic_sect_mid_max_sector.any():
+                    adjustment[logic_sect_mid_max_sector] = wrapped_veer
 
             if i < len(veer_bins) - 1:
                 if not np.isnan(sec_veers[i]) and (np.isnan(sec_veers[i - 1]) and np.isnan(sec_veers[i + 1])):
-                    logic_sect_min_max_sector = self._get_logic_dir_sector(ref_dir=x_dir,
+                    logic_sect_min_max_sector = self._get_logic_dir_sector(ref_dir=x_vals,
                                                                            sector_min=sector_min[i],
                                                                            sector_max=sector_max[i])
-                    if logic_sect_min_max_sector.sum() > 0:
-                        adjustment[logic_sect_min_max_sector] = offset_wind_direction(
-                            x_dir[logic_sect_min_max_sector] * 0, sec_veers[i])
+                    if logic_sect_min_max_sector.any():
+                        adjustment[logic_sect_min_max_sector] = wrapped_veer
 
                 elif not np.isnan(sec_veers[i]) and np.isnan(sec_veers[i + 1]):
-                    logic_sect_mid_max_sector = self._get_logic_dir_sector(ref_dir=x_dir,
+                    logic_sect_mid_max_sector = self._get_logic_dir_sector(ref_dir=x_vals,
                                                                            sector_min=veer_bins[i],
                                                                            sector_max=sector_max[i])
-                    if logic_sect_mid_max_sector.sum() > 0:
-                        adjustment[logic_sect_mid_max_sector] = offset_wind_direction(
-                            x_dir[logic_sect_mid_max_sector] * 0, sec_veers[i])
+                    if logic_sect_mid_max_sector.any():
+                        adjustment[logic_sect_mid_max_sector] = wrapped_veer
 
             elif (sector_min[i] == sector_min[0]) and np.isnan(sec_veers[1]) and not np.isnan(sec_veers[i]):
-                logic_sect_min_max_sector = self._get_logic_dir_sector(ref_dir=x_dir,
+                logic_sect_min_max_sector = self._get_logic_dir_sector(ref_dir=x_vals,
                                                                        sector_min=veer_bins[i],
                                                                        sector_max=sector_max[i])
-                if logic_sect_min_max_sector.sum() > 0:
-                    adjustment[logic_sect_min_max_sector] = offset_wind_direction(
-                        x_dir[logic_sect_min_max_sector] * 0, sec_veers[i])
+                if logic_sect_min_max_sector.any():
+                    adjustment[logic_sect_min_max_sector] = wrapped_veer
 
             # Adjustment is derived interpolating between two veer values from nearby sectors
-            logic_sect_mid_point = self._get_logic_dir_sector(ref_dir=x_dir,
+            logic_sect_mid_point = self._get_logic_dir_sector(ref_dir=x_vals,
                                                               sector_min=veer_bins[i - 1],
                                                               sector_max=veer_bins[i])
 
-            if logic_sect_mid_point.sum() != 0 and not (np.isnan(sec_veers[i]) or np.isnan(sec_veers[i - 1])):
+            if logic_sect_mid_point.any() and not (np.isnan(sec_veers[i]) or np.isnan(sec_veers[i - 1])):
                 adjustment[logic_sect_mid_point] = self._linear_interpolation(veer_bins[i - 1], veer_bins[i],
                                                                               sec_veers[i - 1], sec_veers[i],
-                                                                              x_dir[logic_sect_mid_point])
+                                                                              x_vals[logic_sect_mid_point])
 
-        return offset_wind_direction(x_dir, adjustment).sort_index()
+        # offset_wind_direction would apply the range helper per element; wrap the summed
+        # directions with the vectorized kernel instead.
+        adjusted = _wrap_direction_0_to_360(x_vals + adjustment)
+        return pd.Series(adjusted, index=x_dir.index, name=x_dir.name).sort_index()
 
     def _predict(self, x_spd, x_dir):
-        x = pd.concat([x_spd.rename('spd'),
-                       _binned_direction_series(x_dir, self.sectors,
-                                                direction_bin_array=self.direction_bin_array).rename('ref_dir_bin')],
-                      axis=1, join='inner').dropna()
-        prediction = pd.Series(dtype='float64').rename('spd')
-        for sector, data in x.groupby('ref_dir_bin'):
-            if sector in list(self.speed_model.keys()):
-                prediction_spd = self.speed_model[sector].sector_predict(data['spd'])
-            else:
-                prediction_spd = data['spd'] * np.nan
-
-            prediction = pd.concat([prediction, prediction_spd], axis=0)
-
-        return prediction.sort_index()
+        x = pd.DataFrame({'spd': x_spd,
+                          'ref_dir_bin': _binned_direction_series(x_dir, self.sectors,
+                                                                  direction_bin_array=self.direction_bin_array)
+                          }).dropna()
+        # Gather each sector's fit parameters through one fancy-indexing pass so the whole
+        # bilinear prediction is a single vectorized expression; sectors without a fitted
+        # model have NaN parameters and therefore predict NaN.
+        spd = x['spd'].to_numpy()
+        bins = x['ref_dir_bin'].to_numpy().astype(np.int64)
+        slopes = np.full(self.sectors + 1, np.nan)
+        offsets = np.full(self.sectors + 1, np.nan)
+        cutoffs = np.full(self.sectors + 1, np.nan)
+        for sector, model in self.speed_model.items():
+            slopes[sector] = model.params['slope']
+            offsets[sector] = model.params['offset']
+            cutoffs[sector] = model.params['cutoff']
+        slope = slopes[bins]
+        offset = offsets[bins]
+        cutoff = cutoffs[bins]
+        prediction = np.where(spd < cutoff, (slope * cutoff + offset) * spd / cutoff,
+                              spd * slope + offset)
+
+        return pd.Series(prediction, index=x.index, name='spd').sort_index()
 
     def synthesize(self, input_spd=None, input_dir=None):
 
         if input_spd is None and input_dir is None:
             ref_start_date, target_start_date = self._get_synth_start_dates()
 
-            output = self._predict(tf.average_data_by_period(self.ref_spd[ref_start_date:], self.averaging_prd,
-                                                             return_coverage=False),
-                                   tf.average_data_by_period(self.ref_dir[ref_start_date:], self.averaging_prd,
-                                                             wdir_column_names=self._ref_dir_col_name,
-                                                             return_coverage=False))
-            output = tf.average_data_by_period(self.target_spd[target_start_date:], self.averaging_prd,
-                                               return_coverage=False).combine_first(output)
-            dir_output = self._predict_dir(tf.average_data_by_period(self.ref_dir[ref_start_date:], self.averaging_prd,
-                                                                     wdir_column_names=self._ref_dir_col_name,
-                                                                     return_coverage=False))
-            dir_output = tf.average_data_by_period(self.target_dir[target_start_date:], self.averaging_prd,
-                                                   wdir_column_names=self._tar_dir_col_name,
-                                                   return_coverage=False).combine_first(dir_output)
+            # Average the reference direction once; it is needed by both the speed and the
+            # direction predictions and the aggregation is the heaviest step here.
+            ref_dir_averaged = self._average_for_synth('ref_dir', self.ref_dir, ref_start_date, None,
+                                                       wdir_column_names=self._ref_dir_col_name)
+            output = self._predict(self._average_for_synth('ref_spd', self.ref_spd, ref_start_date, None),
+                                   ref_dir_averaged)
+            output = self._average_for_synth('target_spd', self.target_spd, target_start_date,
+                                             None).combine_first(output)
+            dir_output = self._predict_dir(ref_dir_averaged)
+            dir_output = self._average_for_synth('target_dir', self.target_dir, target_start_date, None,
+                                                 wdir_column_names=self._tar_dir_col_name).combine_first(dir_output)
 
         else:
             output = self._predict(input_spd, input_dir)
             dir_output = self._predict_dir(input_dir)
-        output[output < 0] = 0
+        output = output.clip(lower=0.0)
         return pd.concat([output.rename(self._tar_spd_col_name + "_Synthesized"),
                           dir_output.rename(self._tar_dir_col_name + "_Synthesized")], axis=1, join='outer')
 
@@ -1216,60 +1362,13 @@ class SpeedSort(CorrelBase):
         """
         Plots reference and target directions in a scatter plot
         """
-        return plot_scatter_wdir(
-            self.data[self._ref_dir_col_name][(self.data[self._ref_spd_col_name] > self.cutoff) &
-                                              (self.data[self._tar_spd_col_name] > self.cutoff)],
-            self.data[self._tar_dir_col_name][(self.data[self._ref_spd_col_name] > self.cutoff) &
-                                              (self.data[self._tar_spd_col_name] > self.cutoff)],
-            x_label=self._ref_dir_col_name, y_label=self._tar_dir_col_name)
+        mask = self._above_cutoff_mask
+        return plot_scatter_wdir(self.data.loc[mask, self._ref_dir_col_name],
+                                 self.data.loc[mask, self._tar_dir_col_name],
+                                 x_label=self._ref_dir_col_name, y_label=self._tar_dir_col_name)
 
 
 class SVR:
     def __init__(self, ref_spd, target_spd, averaging_prd, coverage_threshold, bw_model=0, **sklearn_args):
         raise NotImplementedError
-    #     CorrelBase.__init__(self, ref_spd, target_spd, averaging_prd, coverage_threshold)
-    #     bw_models = [{'kernel': 'rbf', 'C': 30, 'gamma': 0.01}, {'kernel': 'linear', 'C': 10}]
-    #     self.model = sklearn_SVR(**{**bw_models[bw_model], **sklearn_args})
-    #
-    # def __repr__(self):
-    #     return 'Support Vector Regression Model ' + str(self.params)
-    #
-    # def run(self, show_params=True):
-    #     if len(self.data[self._ref_spd_col_name].values.shape) == 1:
-    #         x = self.data[self._ref_spd_col_name].values.reshape(-1, 1)
-    #     else:
-    #         x = self.data[self._ref_spd_col_name].values
-    #     self.model.fit(x, self.data[self._tar_spd_col_name].values.flatten())
-    #     self.params = dict()
-    #     self.params['RMSE'] = -1 * sklearn_cross_val_score(self.model, x,
-    #                                                        self.data[self._tar_spd_col_name].values.flatten(),
-    #                                                        scoring='neg_mean_squared_error', cv=3)
-    #     self.params['MAE'] = -1 * sklearn_cross_val_score(self.model, x,
-    #                                                       self.data[self._tar_spd_col_name].values.flatten(),
-    #                                                       scoring='neg_mean_absolute_error', cv=3)
-    #     self.params['Explained Variance'] = -1 * sklearn_cross_val_score(self.model, x,
-    #                                                                      self.data[self._tar_spd_col_name].values.flatten(),
-    #                                                                      scoring='explained_variance', cv=3)
-    #     if show_params:
-    #         self.show_params()
-    #
-    # def _predict(self, x):
-    #     if isinstance(x, pd.Series):
-    #         X = x.values.reshape(-1, 1)
-    #         return pd.DataFrame(data=self.model.predict(X), index=x.index)
-    #     elif isinstance(x, pd.DataFrame):
-    #         X = x.values
-    #         return pd.DataFrame(data=self.model.predict(X), index=x.index)
-    #     else:
-    #         if not len(x.shape) == 2:
-    #             raise ValueError("Expected shape of input data (num of data points, number of reference datasets), "
-    #                              "but found ", x.shape)
-    #         else:
-    #             return self.model.predict(x)
-    #
-    # def plot(self, title=""):
-    #     """For plotting"""
-    #     plot_scatter(self.data[self._ref_spd_col_name],
-    #                  self.data[self._tar_spd_col_name],
-    #                  self._predict(self.data[self._ref_spd_col_name]), trendline_dots=True,
-    #                  x_label=self._ref_spd_col_name, y_label=self._tar_spd_col_name)
+
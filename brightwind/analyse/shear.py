@@ -2,21 +2,90 @@ import pandas as pd
 import numpy as np
 import datetime
 import calendar
-from math import e
 from brightwind.analyse import plot as bw_plt
-from brightwind.transform import transform as tf
 # noinspection PyProtectedMember
 from brightwind.analyse.analyse import dist_by_dir_sector, dist_12x24, coverage, _convert_df_to_series
-from ipywidgets import FloatProgress
-from IPython.display import display
 from IPython.display import clear_output
-import re
 import warnings
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 pd.options.mode.chained_assignment = None
 
 __all__ = ['Shear']
 
+_MONTH_ABBR = tuple(calendar.month_abbr)
+
+
+def _fit_power_law_rows(log_wspds, log_heights):
+    """
+    Row-wise closed-form degree-1 fits for ragged data: entries whose log speed is not finite are
+    left out of that row's fit, and rows with fewer than two usable heights get NaN. Returns the
+    slope (alpha) and intercept of each row's fit.
+    """
+    valid = np.isfinite(log_wspds)
+    counts = valid.sum(axis=1).astype(np.float64)
+    log_wspds_v = np.where(valid, log_wspds, 0.0)
+    log_heights_v = np.where(valid, log_heights, 0.0)
+    sum_x = log_heights_v.sum(axis=1)
+    sum_y = log_wspds_v.sum(axis=1)
+    sum_xx = (log_heights_v * log_heights_v).sum(axis=1)
+    sum_xy = (log_heights_v * log_wspds_v).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        alpha = (counts * sum_xy - sum_x * sum_y) / (counts * sum_xx - sum_x * sum_x)
+        intercept = (sum_y - alpha * sum_x) / counts
+    alpha[counts < 2] = np.nan
+    intercept[counts < 2] = np.nan
+    return alpha, intercept
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _fit_power_law_rows(log_wspds, log_heights):
+        n_rows = log_wspds.shape[0]
+        alpha = np.empty(n_rows)
+        intercept = np.empty(n_rows)
+        for i in prange(n_rows):
+            count = 0.0
+            sum_x = 0.0
+            sum_y = 0.0
+            sum_xx = 0.0
+            sum_xy = 0.0
+            for j in range(log_wspds.shape[1]):
+                value = log_wspds[i, j]
+                if np.isfinite(value):
+                    count += 1.0
+                    sum_x += log_heights[j]
+                    sum_y += value
+                    sum_xx += log_heights[j] * log_heights[j]
+                    sum_xy += log_heights[j] * value
+            if count < 2.0:
+                alpha[i] = np.nan
+                intercept[i] = np.nan
+            else:
+                alpha[i] = (count * sum_xy - sum_x * sum_y) / (count * sum_xx - sum_x * sum_x)
+                intercept[i] = (sum_y - alpha[i] * sum_x) / count
+        return alpha, intercept
+
+
+def _scale_power_law_rows(wspds, alphas, ratio):
+    """
+    Elementwise power-law scaling with a per-row shear exponent: ``wspds * ratio ** alphas``.
+    """
+    return wspds * ratio ** alphas
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _scale_power_law_rows(wspds, alphas, ratio):
+        scaled = np.empty(wspds.size)
+        for i in prange(wspds.size):
+            scaled[i] = wspds[i] * ratio ** alphas[i]
+        return scaled
+
 
 class Shear:
 
@@ -86,17 +155,22 @@ class Shear:
 
             wspds, cvg = Shear._data_prep(wspds=wspds, heights=heights, min_speed=min_speed, maximise_data=maximise_data)
 
+            # _data_prep has already dropped the rows with any speed at or below min_speed, so the
+            # prepared frame can be fitted directly
             if calc_method == 'power_law':
-                alpha_c = (wspds[(wspds > min_speed).all(axis=1)].apply(Shear._calc_power_law, heights=heights,
-                                                                        return_coeff=True,
-                                                                        maximise_data=maximise_data, axis=1))
-                alpha = pd.Series(alpha_c.iloc[:, 0], name='alpha')
+                if maximise_data:
+                    alpha_c = (wspds.apply(Shear._calc_power_law, heights=heights, return_coeff=True,
+                                           maximise_data=maximise_data, axis=1))
+                    alpha = pd.Series(alpha_c.iloc[:, 0], name='alpha')
+                else:
+                    alpha = pd.Series(Shear._calc_power_law_batch(wspds.values, heights),
+                                      index=wspds.index, name='alpha')
                 self._alpha = alpha
 
             elif calc_method == 'log_law':
-                slope_intercept = (wspds[(wspds > min_speed).all(axis=1)].apply(Shear._calc_log_law, heights=heights,
-                                                                                return_coeff=True,
-                                                                                maximise_data=maximise_data, axis=1))
+                log_heights = np.log(np.asarray(heights, dtype=np.float64))
+                slope_intercept = (wspds.apply(Shear._calc_log_law, heights=heights, return_coeff=True,
+                                               maximise_data=maximise_data, log_heights=log_heights, axis=1))
                 slope = slope_intercept.iloc[:, 0]
                 intercept = slope_intercept.iloc[:, 1]
                 roughness_coefficient = pd.Series(Shear._calc_roughness(slope=slope, intercept=intercept),
@@ -228,23 +302,6 @@ class Shear:
 
             wspds, cvg = Shear._data_prep(wspds=wspds, heights=heights, min_speed=min_speed)
 
-            # get data resolution
-            resolution = tf._get_data_resolution(wspds.index)
-
-            # initialise empty series for later use
-            start_times = pd.Series([], dtype='float64')
-            time_wspds = pd.Series([], dtype='float64')
-            mean_time_wspds = pd.Series([], dtype='float64')
-            c = pd.Series([], dtype='float64')
-            slope = pd.Series([], dtype='float64')
-            intercept = pd.Series([], dtype='float64')
-            alpha = pd.Series([], dtype='float64')
-            roughness = pd.Series([], dtype='float64')
-            slope_df = pd.DataFrame([])
-            intercept_df = pd.DataFrame([])
-            roughness_df = pd.DataFrame([])
-            alpha_df = pd.DataFrame([])
-
             # time of day shear calculations
             interval = int(24 / segments_per_day)
 
@@ -257,62 +314,64 @@ class Shear:
             if not (24 % segments_per_day == 0):
                 raise ValueError("'segments_per_day' must be a divisor of 24.")
 
-            segment_start_time = str(segment_start_time)
-            start_times[0] = datetime.datetime.strptime(segment_start_time, '%H')
-            dt = datetime.timedelta(hours=interval)
-
-            # extract wind speeds for each daily segment
-            for i in range(1, segments_per_day):
-                start_times[i] = start_times[i - 1] + dt
+            # start time of each daily segment
+            segment_start = datetime.datetime(1900, 1, 1, hour=segment_start_time)
+            start_times = [segment_start + datetime.timedelta(hours=interval * i)
+                           for i in range(segments_per_day)]
 
             # extract wind speeds for each month
             months_tot = pd.unique(wspds.index.month.values)
-            for j in months_tot:
 
-                anemometers_df = wspds[wspds.index.month == j]
-                for i in range(0, segments_per_day):
+            # preallocate one segments x months cell per result rather than growing Series and
+            # concatenating a column per month
+            if calc_method == 'power_law':
+                alpha_arr = np.empty((segments_per_day, len(months_tot)))
+            elif calc_method == 'log_law':
+                slope_arr = np.empty((segments_per_day, len(months_tot)))
+                intercept_arr = np.empty((segments_per_day, len(months_tot)))
+                roughness_arr = np.empty((segments_per_day, len(months_tot)))
 
-                    if segments_per_day == 1:
-                        mean_time_wspds[i] = anemometers_df.mean().dropna()
+            # assign each time-step to its daily segment once and take every segment-month mean in
+            # a single pass, instead of filtering the frame per month and slicing each segment out
+            # of it with between_time
+            segment_ids = ((wspds.index.hour - start_times[0].hour) % 24) // interval
+            mean_wspds_by_bin = wspds.groupby([wspds.index.month, segment_ids]).mean()
+
+            # error check
+            if mean_wspds_by_bin.shape[0] == 0:
+                raise ValueError('None of the input wind speeds are greater than the min_speed, cannot calculate shear')
 
-                    elif i == segments_per_day - 1:
-                        start = str(start_times[i].time())
-                        end = str((start_times[0] - resolution).time())
-                        time_wspds[i] = pd.DataFrame(anemometers_df).between_time(start, end)
-                        mean_time_wspds[i] = time_wspds[i][(time_wspds[i] > min_speed).all(axis=1)].mean().dropna()
+            mean_wspds_by_bin = mean_wspds_by_bin.reindex(pd.MultiIndex.from_product([months_tot,
+                                                                                      range(segments_per_day)]))
+            # the reindexed rows are month-major, so one reshape exposes each (month, segment) mean
+            # as a plain array row without a MultiIndex lookup per cell
+            bin_means = mean_wspds_by_bin.values.reshape(len(months_tot), segments_per_day, -1)
 
-                    else:
-                        start = str(start_times[i].time())
-                        end = str((start_times[i + 1] - resolution).time())
-                        time_wspds[i] = pd.DataFrame(anemometers_df).between_time(start, end)
-                        mean_time_wspds[i] = time_wspds[i][(time_wspds[i] > min_speed).all(axis=1)].mean().dropna()
+            # calculate shear
+            log_heights = np.log(np.asarray(heights, dtype=np.float64))
+            for col, j in enumerate(months_tot):
 
-                # calculate shear
                 if calc_method == 'power_law':
-                    for i in range(0, len(mean_time_wspds)):
-                        alpha[i], c[i] = Shear._calc_power_law(mean_time_wspds[i].values, heights, return_coeff=True)
-                    alpha_df = pd.concat([alpha_df, alpha], axis=1)
+                    for i in range(0, segments_per_day):
+                        alpha_arr[i, col] = Shear._calc_power_law(bin_means[col, i], heights,
+                                                                  log_heights=log_heights)
 
                 if calc_method == 'log_law':
-                    for i in range(0, len(mean_time_wspds)):
-                        slope[i], intercept[i] = Shear._calc_log_law(mean_time_wspds[i].values, heights,
-                                                                     return_coeff=True)
-                        roughness[i] = Shear._calc_roughness(slope=slope[i], intercept=intercept[i])
-                    roughness_df = pd.concat([roughness_df, roughness], axis=1)
-                    slope_df = pd.concat([slope_df, slope], axis=1)
-                    intercept_df = pd.concat([intercept_df, intercept], axis=1)
-
-            # error check
-            if mean_time_wspds.shape[0] == 0:
-                raise ValueError('None of the input wind speeds are greater than the min_speed, cannot calculate shear')
+                    for i in range(0, segments_per_day):
+                        slope_arr[i, col], intercept_arr[i, col] = \
+                            Shear._calc_log_law(bin_means[col, i], heights, return_coeff=True,
+                                                log_heights=log_heights)
+                        roughness_arr[i, col] = Shear._calc_roughness(slope=slope_arr[i, col],
+                                                                      intercept=intercept_arr[i, col])
 
             if calc_method == 'power_law':
+                alpha_df = pd.DataFrame(alpha_arr)
                 alpha_df.index = start_times
                 alpha_df.index = alpha_df.index.time
                 alpha_df.sort_index(inplace=True)
 
                 if by_month is True:
-                    alpha_df.columns = [calendar.month_abbr[month] for month in months_tot]
+                    alpha_df.columns = [_MONTH_ABBR[month] for month in months_tot]
                     self.plot = bw_plt.plot_shear_time_of_day(Shear._fill_df_12x24(alpha_df), calc_method=calc_method,
                                                               plot_type=plot_type)
 
@@ -328,6 +387,9 @@ class Shear:
                 self._alpha = alpha_df
 
             if calc_method == 'log_law':
+                roughness_df = pd.DataFrame(roughness_arr)
+                slope_df = pd.DataFrame(slope_arr)
+                intercept_df = pd.DataFrame(intercept_arr)
                 roughness_df.index = slope_df.index = intercept_df.index = start_times
                 roughness_df.index = slope_df.index = intercept_df.index = roughness_df.index.time
                 roughness_df.sort_index(inplace=True)
@@ -337,7 +399,7 @@ class Shear:
 
                 if by_month is True:
                     roughness_df.columns = slope_df.columns = intercept_df.columns = \
-                                                                    [calendar.month_abbr[month] for month in months_tot]
+                                                                    [_MONTH_ABBR[month] for month in months_tot]
                     self.plot = bw_plt.plot_shear_time_of_day(Shear._fill_df_12x24(roughness_df),
                                                               calc_method=calc_method, plot_type=plot_type)
                 else:
@@ -621,8 +683,13 @@ class Shear:
             wdir = _convert_df_to_series(wdir)
             mean_wspds = pd.Series([], dtype='float64')
             mean_wspds_df = pd.DataFrame([])
-            count_df = pd.DataFrame([])
-            count = pd.Series([], dtype='float64')
+
+            # the prepared frame has no NaNs left, so the per-sector counts are identical for every
+            # anemometer; bin the counts once instead of once per column
+            plot, count_df = dist_by_dir_sector(wspds.iloc[:, 0], wdir, direction_bin_array=direction_bin_array,
+                                                sectors=sectors,
+                                                aggregation_method='count', return_data=True)
+            count_df = count_df.astype(np.float64)
 
             for i in range(len(wspds.columns)):
 
@@ -631,18 +698,10 @@ class Shear:
                                                          sectors=sectors,
                                                          aggregation_method='mean', return_data=True)
 
-                plot, count[i] = dist_by_dir_sector(w, wdir, direction_bin_array=direction_bin_array,
-                                                    sectors=sectors,
-                                                    aggregation_method='count', return_data=True)
-
                 if i == 0:
                     mean_wspds_df = mean_wspds[i].copy()
-                    count_df = count[i].copy()
                 else:
                     mean_wspds_df = pd.concat([mean_wspds_df, mean_wspds[i]], axis=1)
-                    count_df = pd.concat([count_df, count[i]], axis=1)
-
-            count_df = count_df.mean(axis=1)
             wind_rose_plot, wind_rose_dist = dist_by_dir_sector(wspds.iloc[:, 0], wdir,
                                                                 direction_bin_array=direction_bin_array,
                                                                 sectors=sectors,
@@ -650,13 +709,8 @@ class Shear:
                                                                 return_data=True)
             if calc_method == 'power_law':
 
-                alpha = mean_wspds_df.apply(Shear._calc_power_law, heights=heights, return_coeff=False, axis=1)
-
-                wind_rose_plot, wind_rose_dist = dist_by_dir_sector(wspds.iloc[:, 0], wdir,
-                                                                    direction_bin_array=direction_bin_array,
-                                                                    sectors=sectors,
-                                                                    direction_bin_labels=direction_bin_labels,
-                                                                    return_data=True)
+                alpha = pd.Series(Shear._calc_power_law_batch(mean_wspds_df.values, heights),
+                                  index=mean_wspds_df.index)
 
                 self.alpha_count = count_df
                 self._alpha = pd.Series(alpha, name='alpha')
@@ -666,7 +720,9 @@ class Shear:
 
             elif calc_method == 'log_law':
 
-                slope_intercept = mean_wspds_df.apply(Shear._calc_log_law, heights=heights, return_coeff=True, axis=1)
+                slope_intercept = mean_wspds_df.apply(Shear._calc_log_law, heights=heights, return_coeff=True,
+                                                      log_heights=np.log(np.asarray(heights, dtype=np.float64)),
+                                                      axis=1)
 
                 slope = slope_intercept.iloc[:, 0]
                 intercept = slope_intercept.iloc[:, 1]
@@ -768,7 +824,7 @@ class Shear:
         return scaled_wspds
 
     @staticmethod
-    def _calc_log_law(wspds, heights, return_coeff=False, maximise_data=False) -> (np.array, float):
+    def _calc_log_law(wspds, heights, return_coeff=False, maximise_data=False, log_heights=None) -> (np.array, float):
         """
         Derive the best fit logarithmic law line from a given time-step of speed data at 2 or more elevations
 
@@ -808,16 +864,24 @@ class Shear:
                 pd.Series(heights).drop(wspds[wspds == 0].index.values.astype(int)))  # take log of elevations
             wspds = wspds.drop(wspds[wspds == 0].index.values.astype(int))
 
-        else:
+        elif log_heights is None:
             log_heights = np.log(heights)  # take log of elevations
 
+        if not maximise_data and len(log_heights) == 2:
+            # two points define the line exactly, no least squares needed
+            wspds = np.asarray(wspds)
+            slope = (wspds[0] - wspds[1]) / (log_heights[0] - log_heights[1])
+            if return_coeff:
+                return pd.Series([slope, wspds[0] - slope * log_heights[0]])
+            return slope
+
         coeffs = np.polyfit(log_heights, wspds, deg=1)
         if return_coeff:
             return pd.Series([coeffs[0], coeffs[1]])
         return coeffs[0]
 
     @staticmethod
-    def _calc_power_law(wspds, heights, return_coeff=False, maximise_data=False) -> (np.array, float):
+    def _calc_power_law(wspds, heights, return_coeff=False, maximise_data=False, log_heights=None) -> (np.array, float):
         """
         Derive the best fit power law exponent (as 1/alpha) from a given time-step of speed data at 2 or more elevations
 
@@ -839,24 +903,65 @@ class Shear:
         if maximise_data:
             log_heights = np.log(pd.Series(heights).drop(wspds[wspds == 0].index.values.astype(int)))
             log_wspds = np.log(wspds.drop(wspds[wspds == 0].index.values.astype(int)))
+            coeffs = np.polyfit(log_heights, log_wspds, deg=1)
+            alpha, intercept = coeffs[0], coeffs[1]
 
         else:
-            log_heights = np.log(heights)  # take log of elevations
+            if log_heights is None:
+                log_heights = np.log(heights)  # take log of elevations
             log_wspds = np.log(wspds)  # take log of speeds
+            if len(log_heights) == 2:
+                # two points define the line exactly, no least squares needed
+                alpha = (log_wspds[0] - log_wspds[1]) / (log_heights[0] - log_heights[1])
+                intercept = log_wspds[0] - alpha * log_heights[0]
+            else:
+                # a degree-1 fit has a closed-form solution, which skips the workspace setup of a
+                # full least squares solve for these tiny systems
+                centred_heights = log_heights - np.mean(log_heights)
+                alpha = (centred_heights @ (log_wspds - np.mean(log_wspds))) / (centred_heights @ centred_heights)
+                intercept = np.mean(log_wspds) - alpha * np.mean(log_heights)
 
-        coeffs = np.polyfit(log_heights, log_wspds, deg=1)  # get coefficients of linear best fit to log distribution
         if return_coeff:
-            return pd.Series([coeffs[0], np.exp(coeffs[1])])
-        return coeffs[0]
+            return pd.Series([alpha, np.exp(intercept)])
+        return alpha
+
+    @staticmethod
+    def _calc_power_law_batch(wspds, heights, return_coeff=False):
+        """
+        Derive the best fit power law exponents for many time-steps in one go.
+
+        Solves the degree-1 least squares fit on the log-log distribution in closed form for every row
+        of the input at once, instead of calling np.polyfit once per time-step.
+
+        :param wspds: 2D array of wind speeds [m/s], one row per time-step, one column per height.
+        :param heights: List of heights [m above ground] matching the columns of wspds.
+        :return: Array of alpha values, and of the power law coefficients if return_coeff is True.
+
+        """
+        log_heights = np.log(np.asarray(heights, dtype=np.float64))
+        log_wspds = np.log(np.asarray(wspds, dtype=np.float64))
+        if not np.isfinite(log_wspds).all():
+            # ragged rows: fit each row on its finite heights only
+            alpha, intercept = _fit_power_law_rows(log_wspds, log_heights)
+            if return_coeff:
+                return alpha, np.exp(intercept)
+            return alpha
+        centred_heights = log_heights - log_heights.mean()
+        mean_log_wspds = log_wspds.mean(axis=1)
+        alpha = ((log_wspds - mean_log_wspds[:, None]) @ centred_heights) / (centred_heights @ centred_heights)
+        if return_coeff:
+            return alpha, np.exp(mean_log_wspds - alpha * log_heights.mean())
+        return alpha
 
     @staticmethod
     def _calc_roughness(slope, intercept):
-        return e**(-intercept/slope)
+        return np.exp(-intercept/slope)
 
     @staticmethod
     def _by_12x24(wspds, heights, min_speed=3, return_data=False, var_name='Shear'):
-        tab_12x24 = dist_12x24(wspds[(wspds > min_speed).all(axis=1)].apply(Shear._calc_power_law, heights=heights,
-                                                                            axis=1), return_data=True)[1]
+        wspds_f = wspds[(wspds > min_speed).all(axis=1)]
+        alpha_ts = pd.Series(Shear._calc_power_law_batch(wspds_f.values, heights), index=wspds_f.index)
+        tab_12x24 = dist_12x24(alpha_ts, return_data=True)[1]
         if return_data:
             return bw_plt.plot_12x24_contours(tab_12x24, label=(var_name, 'mean')), tab_12x24
         return bw_plt.plot_12x24_contours(tab_12x24, label=(var_name, 'mean'))
@@ -905,7 +1010,7 @@ class Shear:
                             alpha=alpha, roughness=roughness)
 
     @staticmethod
-    def _scale(wspds, height, shear_to, calc_method='power_law', alpha=None, roughness=None, origin=None):
+    def _scale(wspds, height, shear_to, calc_method='power_law', alpha=None, roughness=None):
         """
         Private function for execution of scale()
         """
@@ -913,15 +1018,22 @@ class Shear:
             wspds = pd.Series(wspds)
 
         if calc_method == 'power_law':
-            scale_factor = (shear_to / height) ** alpha
-            scaled_wspds = wspds * scale_factor
+            if isinstance(alpha, pd.Series) and alpha.index.equals(wspds.index):
+                # per-time-step exponents: compute on the raw arrays so the pow and multiply run
+                # without index alignment between the two series
+                scaled_wspds = pd.Series(_scale_power_law_rows(wspds.to_numpy(dtype=np.float64),
+                                                               alpha.to_numpy(dtype=np.float64),
+                                                               shear_to / height),
+                                         index=wspds.index, name=wspds.name)
+            else:
+                scale_factor = (shear_to / height) ** alpha
+                scaled_wspds = wspds * scale_factor
 
         elif calc_method == 'log_law':
-            if origin == 'TimeSeries':
-                scaled_wspds = Shear._log_roughness_scale(wspds=wspds, height=height,
-                                                          shear_to=shear_to, roughness=roughness)
-            else:
-                scaled_wspds = wspds.apply(Shear._log_roughness_scale, args=(height, shear_to, roughness))
+            # _log_roughness_scale is plain arithmetic, so apply it to the whole series at once
+            # rather than once per element
+            scaled_wspds = Shear._log_roughness_scale(wspds=wspds, height=height,
+                                                      shear_to=shear_to, roughness=roughness)
         else:
             raise ValueError("Please enter a valid calculation method, either 'power_law' or 'log_law'.")
 
@@ -943,7 +1055,7 @@ class Shear:
                 df = pd.concat([wspds, self.roughness], axis=1).dropna()
                 scaled_wspds = Shear._scale(wspds=df.iloc[:, 0], height=height, shear_to=shear_to,
                                             calc_method=self.calc_method,
-                                            roughness=self._roughness, origin=self.origin)
+                                            roughness=self._roughness)
 
             result = scaled_wspds.dropna()
 
@@ -956,89 +1068,70 @@ class Shear:
                 filled_roughness = Shear._fill_df_12x24(self._roughness)
                 filled_alpha = filled_roughness
 
-            df_wspds = [[None for y in range(12)] for x in range(24)]
-            f = FloatProgress(min=0, max=24 * 12, description='Calculating', bar_style='success')
-            display(f)
-
-            for i in range(0, 24):
+            # The filled table always has 24 hourly rows by 12 months, so the coefficient for each
+            # time-step can be gathered straight from it with the row's hour and month instead of
+            # scanning the wind speed series once per table cell.
+            coeffs = filled_alpha.values[wspds.index.hour, wspds.index.month - 1].astype(np.float64)
 
-                for j in range(0, 12):
-
-                    if i == 23:
-                        df_wspds[i][j] = wspds[
-                            (wspds.index.time >= filled_alpha.index[i]) & (wspds.index.month == j + 1)]
-                    else:
-                        df_wspds[i][j] = wspds[
-                            (wspds.index.time >= filled_alpha.index[i]) & (wspds.index.time < filled_alpha.index[i + 1])
-                            & (wspds.index.month == j + 1)]
-
-                    if self.calc_method == 'power_law':
-                        df_wspds[i][j] = Shear._scale(df_wspds[i][j], shear_to=shear_to, height=height,
-                                                      alpha=filled_alpha.iloc[i, j], calc_method=self.calc_method)
-
-                    else:
-                        df_wspds[i][j] = Shear._scale(df_wspds[i][j], shear_to=shear_to, height=height,
-                                                      roughness=filled_roughness.iloc[i, j],
-                                                      calc_method=self.calc_method)
-
-                    scaled_wspds = pd.concat([scaled_wspds, df_wspds[i][j]], axis=0)
-                    f.value += 1
+            if self.calc_method == 'power_law':
+                scaled_wspds = pd.Series(_scale_power_law_rows(wspds.to_numpy(dtype=np.float64), coeffs,
+                                                               shear_to / height), index=wspds.index)
+            else:
+                scaled_wspds = pd.Series(Shear._log_roughness_scale(wspds=wspds.values, height=height,
+                                                                    shear_to=shear_to, roughness=coeffs),
+                                         index=wspds.index)
 
             result = scaled_wspds.sort_index()
-            f.close()
 
         if self.origin == 'BySector':
 
-            # initialise series for later use
-            bin_edges = pd.Series([], dtype='float64')
-            by_sector = pd.Series([], dtype='float64')
-
             if self.calc_method == 'power_law':
                 direction_bins = self.alpha
             else:
                 direction_bins = self._roughness
 
-            # join wind speeds and directions together in DataFrame
+            # align wind speeds and directions on a common index; both columns are consumed as raw
+            # arrays below, so positional access replaces the column renames
             df = pd.concat([wspds, wdir], axis=1)
-            df.columns = ['Unscaled_Wind_Speeds', 'Wind_Direction']
 
-            # get directional bin edges from Shear.by_sector output
-            for i in range(self.sectors):
-                bin_edges[i] = float(re.findall(r"[-+]?\d*\.\d+|\d+", direction_bins.index[i])[0])
-                if i == self.sectors - 1:
-                    bin_edges[i + 1] = -float(re.findall(r"[-+]?\d*\.\d+|\d+", direction_bins.index[i])[1])
-
-            for i in range(0, self.sectors):
-                if bin_edges[i] > bin_edges[i + 1]:
-                    by_sector[i] = df[
-                        (df['Wind_Direction'] >= bin_edges[i]) | (df['Wind_Direction'] < bin_edges[i + 1])]
-
-                elif bin_edges[i + 1] == 360:
-                    by_sector[i] = df[(df['Wind_Direction'] >= bin_edges[i])]
-
-                else:
-                    by_sector[i] = df[
-                        (df['Wind_Direction'] >= bin_edges[i]) & (df['Wind_Direction'] < bin_edges[i + 1])]
-
-                by_sector[i].columns = ['Unscaled_Wind_Speeds', 'Wind_Direction']
-
-                if self.calc_method == 'power_law':
-                    scaled_wspds[i] = Shear._scale(wspds=by_sector[i]['Unscaled_Wind_Speeds'], height=height,
-                                                   shear_to=shear_to,
-                                                   calc_method=self.calc_method, alpha=self.alpha[i])
+            # get directional bin edges from Shear.by_sector output by splitting each sector label,
+            # such as '345.0-15.0' or '330-360', on the range dash; direction edges are never
+            # negative, so the dash only ever separates the two edges
+            bounds = [label.split('-') for label in direction_bins.index[:self.sectors]]
+            bin_edges = np.empty(self.sectors + 1)
+            bin_edges[:self.sectors] = [float(bound[0]) for bound in bounds]
+            bin_edges[self.sectors] = float(bounds[-1][-1])
+
+            # bucket every row once: a single searchsorted against the interior edges replaces the
+            # two boolean scans of the direction column per sector; rows outside every sector
+            # (NaN or uncovered directions) get -1 and drop out, as with the old masks. pd.cut
+            # would bin in one C pass too but cannot express the first sector wrapping through 360
+            wdir_vals = df.iloc[:, 1].to_numpy(dtype='float64')
+            sector_ids = np.searchsorted(bin_edges[1:-1], wdir_vals, side='right')
+            if bin_edges[0] > bin_edges[1]:
+                # the first sector wraps through 360, so directions from its lower edge up belong to it
+                sector_ids[wdir_vals >= bin_edges[0]] = 0
+            else:
+                sector_ids[wdir_vals < bin_edges[0]] = -1
+                if bin_edges[-1] != 360:
+                    sector_ids[wdir_vals >= bin_edges[-1]] = -1
+            sector_ids[np.isnan(wdir_vals)] = -1
 
-                elif self.calc_method == 'log_law':
-                    scaled_wspds[i] = Shear._scale(wspds=by_sector[i]['Unscaled_Wind_Speeds'], height=height,
-                                                   shear_to=shear_to,
-                                                   calc_method=self.calc_method,
-                                                   roughness=self._roughness[i])
+            # gather each row's coefficient from its sector id and scale all sectors in one
+            # vector operation instead of one _scale call per sector
+            valid = sector_ids >= 0
+            coeff_vec = direction_bins.to_numpy()[sector_ids[valid]]
+            unscaled = df.iloc[:, 0].to_numpy(dtype='float64')[valid]
 
-                if i == 0:
-                    result = scaled_wspds[i]
-                else:
-                    result = pd.concat([result, scaled_wspds[i]], axis=0)
+            if self.calc_method == 'power_law':
+                scaled = _scale_power_law_rows(unscaled, coeff_vec, shear_to / height)
+            else:
+                scaled = Shear._log_roughness_scale(wspds=unscaled, height=height,
+                                                    shear_to=shear_to, roughness=coeff_vec)
 
-            result.sort_index(axis='index', inplace=True)
+            # the scaled values were produced in row order, so unlike the old per-sector
+            # fragments the result needs no sort
+            result = pd.Series(scaled, index=df.index[valid])
 
         if self.origin == 'Average':
 
@@ -1070,23 +1163,16 @@ class Shear:
         :return: 12x24 pandas.DataFrame
 
         """
-        # create copy for later use
-        df_copy = data.copy()
+        # the input is only read from, so no defensive copy is needed
+        df_copy = data
         interval = int(24 / len(data))
-        # set index for new data frame to deal with less than 24 sectors
+        # hourly index to deal with less than 24 sectors
         idx = pd.date_range('2017-01-01 00:00', '2017-01-01 23:00', freq='1H')
 
-        # create new dataframe with 24 rows only interval number of unique values
-        df = pd.DataFrame({cols: [np.NaN] for cols in df_copy.columns}, index=pd.DatetimeIndex(idx).time)
-        df = pd.concat(
-            [(df[df_copy.index[0].hour:]), (df[:df_copy.index[0].hour])],
-            axis=0)
-
-        for i in range(0, len(df_copy)):
-            df.iloc[i * interval:(i + 1) * interval, :] = pd.DataFrame(df_copy.iloc[i, :]).values.T
-
-        df.sort_index(inplace=True)
-        df_copy.sort_index(inplace=True)
+        # duplicate each segment over its hours and roll the block so that row k holds the
+        # segment covering hour k, building the 24-row frame once already in hour order
+        values = np.roll(np.repeat(df_copy.values, interval, axis=0), df_copy.index[0].hour, axis=0)
+        df = pd.DataFrame(values, index=pd.DatetimeIndex(idx).time, columns=df_copy.columns)
 
         if len(df.columns) == 1:
             df_12x24 = pd.DataFrame([[None for y in range(12)] for x in range(24)])
@@ -1107,9 +1193,12 @@ class Shear:
             Shear._unequal_wspd_heights_error_msg(wspds, heights)
 
         cvg = None
+        # filter to rows where every anemometer reads above min_speed once, and reuse the result
+        # for both the coverage calculation and the returned frame
+        filtered_wspds = wspds[(wspds > min_speed).all(axis=1)]
         if isinstance(wspds.index, pd.DatetimeIndex):
             if maximise_data is False:
-                cvg = coverage(wspds[wspds > min_speed].dropna(), period='1AS').sum()[1]
+                cvg = coverage(filtered_wspds, period='1AS').sum()[1]
             else:
                 _wspds = wspds[wspds > min_speed]
                 count = _wspds.count(axis=1)
@@ -1117,9 +1206,7 @@ class Shear:
                 count.rename('count', inplace=True)
                 cvg = coverage(count, period='1AS').sum()
 
-        wspds = wspds[wspds > min_speed].dropna()
-
-        return wspds, cvg
+        return filtered_wspds, cvg
 
     @staticmethod
     def _unequal_wspd_heights_error_msg(wspds, heights):
@@ -1,7 +1,10 @@
+import contextlib
 import os
+from pathlib import Path
 import pandas as pd
 import datetime
 import re
+import warnings
 import brightwind
 
 __all__ = ['export_tab_file', 'export_csv']
@@ -68,44 +71,43 @@ def export_tab_file(freq_tab, height, lat, long, file_name=None, folder_path=Non
 
     local_freq_tab = freq_tab.copy()
 
-    speed_interval = {interval.right - interval.left for interval in local_freq_tab.index}
-    if len(speed_interval) != 1:
-        import warnings
+    # the index is a CategoricalIndex of intervals when the freq table was derived from a DataFrame
+    interval_index = local_freq_tab.index.astype('interval')
+    bin_widths = interval_index.length
+    if not (bin_widths == bin_widths[0]).all():
         warnings.warn("All speed bins not of equal lengths")
-    speed_interval = speed_interval.pop()
+    speed_interval = bin_widths[0]
 
-    local_freq_tab.index = [interval.right for interval in local_freq_tab.index]
+    local_freq_tab.index = interval_index.right
 
     mean_wind_speed = _calc_mean_speed_of_freq_tab(freq_tab)
     current_timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     version = brightwind.__version__
     sectors = len(local_freq_tab.columns)
 
-    tab_string = "{0} created using brightwind version {1} at {2}. Mean wind speed derived from this tab file is: " \
-                 "{3} m/s.\n{4} {5} {6}\n " \
-                 "{7} {8} {9}\n ".format(str(file_name_print), version, str(current_timestamp),
-                                         "{:.3f}".format(mean_wind_speed),
-                                         "{:.2f}".format(lat), "{:.2f}".format(long), "{:.2f}".format(height),
-                                         str(sectors), "{:.2f}".format(speed_interval), "{:.2f}".format(dir_offset))
+    header = "{0} created using brightwind version {1} at {2}. Mean wind speed derived from this tab file is: " \
+             "{3} m/s.\n{4} {5} {6}\n " \
+             "{7} {8} {9}\n ".format(str(file_name_print), version, str(current_timestamp),
+                                     "{:.3f}".format(mean_wind_speed),
+                                     "{:.2f}".format(lat), "{:.2f}".format(long), "{:.2f}".format(height),
+                                     str(sectors), "{:.2f}".format(speed_interval), "{:.2f}".format(dir_offset))
 
     sum_of_sectors = local_freq_tab.sum(axis=0)
-    tab_string += " ".join("{:.2f}".format(sector_percent) for sector_percent in sum_of_sectors.values) + "\n"
+    sector_sums = " ".join("{:.2f}".format(sector_percent) for sector_percent in sum_of_sectors.values) + "\n"
 
-    for column in local_freq_tab.columns:
-        local_freq_tab[column] = (local_freq_tab[column] / sum(local_freq_tab[column])) * 1000.0
-
-    tab_string += local_freq_tab.to_string(header=False, float_format='%.2f', na_rep=0.00)
-    tab_string_strip = re.sub(' +', ' ', tab_string)
+    local_freq_tab = local_freq_tab.div(local_freq_tab.sum(axis=0), axis=1) * 1000.0
 
+    # stream each part to the file rather than concatenating them into one large string first
     with open(str(file_path), "w") as file:
-        file.write(tab_string_strip)
+        for part in (header, sector_sums, local_freq_tab.to_string(header=False, float_format='%.2f', na_rep=0.00)):
+            file.write(re.sub(' +', ' ', part))
     print('Export of tab file "{0}" successful.\nMean wind speed derived from this tab file is: ' 
           '{1} m/s.\nLatitude: {2}N, Longitude: {3}E, Height: {4} m\n'
           ''.format(str(file_name), "{:.3f}".format(mean_wind_speed),
                     str(lat), str(long), str(height)))
 
 
-def export_csv(data, file_name=None, folder_path=None, **kwargs):
+def export_csv(data, file_name=None, folder_path=None, overwrite=True, **kwargs):
     """
     Export a DataFrame, Series or Array to a .csv file or a .tab. The pandas.to_csv documentation can be found at
     https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.to_csv.html
@@ -117,7 +119,11 @@ def export_csv(data, file_name=None, folder_path=None, **kwargs):
     :type file_name: str
     :param folder_path: The directory where the CSV will be saved, default is the working directory
     :type folder_path: str
-    :param kwargs: All the kwargs that can be passed to pandas.to_csv.
+    :param overwrite: If False, raise FileExistsError instead of replacing an existing file. The check
+           never blocks on user input, so batch exports can run unattended or in parallel.
+    :type overwrite: bool
+    :param kwargs: All the kwargs that can be passed to pandas.to_csv. Additionally, engine='pyarrow'
+           may be given to write through pyarrow's multithreaded csv writer if pyarrow is installed.
     :return exports a .csv or .tab file
 
     **Example usage**
@@ -136,6 +142,12 @@ def export_csv(data, file_name=None, folder_path=None, **kwargs):
         bw.export_csv(df, file_name='file_exported.tab', sep='\t')
 
     """
+    # normalise the input to a frame once so there is a single write path below
+    if not isinstance(data, (pd.DataFrame, pd.Series)):
+        data = pd.DataFrame(data)
+        kwargs.setdefault('header', None)
+        kwargs.setdefault('index', None)
+
     if file_name is None:
         file_name = str(datetime.datetime.now().strftime("%Y-%m-%d")) + '_brightwind_csv_export.csv'
 
@@ -145,12 +157,44 @@ def export_csv(data, file_name=None, folder_path=None, **kwargs):
     if folder_path is None:
         folder_path = os.getcwd()
 
-    if os.path.isdir(folder_path):
-        file_path = os.path.normpath(os.path.join(folder_path, file_name))
-        if isinstance(data, (pd.DataFrame, pd.Series)):
-            data.to_csv(file_path, **kwargs)
+    folder = Path(folder_path)
+    if folder.is_dir():
+        file_path = folder / file_name
+        if not overwrite and file_path.is_file():
+            raise FileExistsError(file_path)
+        if kwargs.get('engine') == 'pyarrow':
+            # multithreaded C++ csv writer, considerably faster than to_csv for wide numeric
+            # frames; imported inside the branch so pyarrow stays an optional dependency. Any
+            # other engine value is left in kwargs for to_csv to reject.
+            kwargs.pop('engine')
+            include_header = kwargs.pop('header', True)
+            write_index = kwargs.pop('index', True)
+            if kwargs:
+                raise ValueError("engine='pyarrow' cannot honour the to_csv kwargs: {}. Use the "
+                                 "default engine for those options.".format(', '.join(sorted(kwargs))))
+            import pyarrow
+            import pyarrow.csv
+            frame = data.to_frame() if isinstance(data, pd.Series) else data
+            if write_index:
+                # to_csv writes the index as the leading column, so mirror that instead of letting
+                # from_pandas embed it under a generated name
+                frame = frame.reset_index()
+                if data.index.name is None:
+                    frame = frame.rename(columns={frame.columns[0]: ''})
+            write_options = pyarrow.csv.WriteOptions(include_header=bool(include_header))
+            pyarrow.csv.write_csv(pyarrow.Table.from_pandas(frame, preserve_index=False), file_path,
+                                  write_options=write_options)
         else:
-            pd.DataFrame(data).to_csv(file_path, header=None, index=None, **kwargs)
+            # write through an explicitly buffered handle so large exports issue fewer syscalls;
+            # pandas is handed the path instead whenever it must open the file itself, i.e. to
+            # drive compression from the name or to honour a mode or encoding kwarg
+            if any(key in kwargs for key in ('compression', 'mode', 'encoding')) \
+                    or file_name.endswith(('.gz', '.bz2', '.zip', '.xz', '.zst')):
+                output_file = contextlib.nullcontext(file_path)
+            else:
+                output_file = open(file_path, 'w', buffering=1 << 20, newline='')
+            with output_file as output:
+                data.to_csv(output, **kwargs)
     else:
         raise NotADirectoryError("The destination folder doesn't seem to exist.")
     print('Export to csv successful.')
@@ -2,6 +2,7 @@ import pytest
 import brightwind as bw
 import os
 import numpy as np
+import pandas as pd
 
 DATA = bw.load_csv(bw.demo_datasets.demo_data)
 DATA = bw.apply_cleaning(DATA, bw.demo_datasets.demo_cleaning_file)
@@ -27,6 +28,34 @@ def test_export_to_csv():
     assert True
 
 
+def test_export_to_csv_overwrite():
+    file_path = os.path.join(TEMP_FOLDER, 'export_overwrite_check.csv')
+    bw.export_csv(pd.DataFrame({'a': [1]}), file_name='export_overwrite_check', folder_path=TEMP_FOLDER)
+    with pytest.raises(FileExistsError):
+        bw.export_csv(pd.DataFrame({'a': [2]}), file_name='export_overwrite_check', folder_path=TEMP_FOLDER,
+                      overwrite=False)
+    assert pd.read_csv(file_path, index_col=0)['a'].iloc[0] == 1
+    bw.export_csv(pd.DataFrame({'a': [2]}), file_name='export_overwrite_check', folder_path=TEMP_FOLDER)
+    assert pd.read_csv(file_path, index_col=0)['a'].iloc[0] == 2
+
+
+def test_export_to_csv_pyarrow():
+    pytest.importorskip('pyarrow')
+    bw.export_csv(DATA, file_name='export_pandas_engine', folder_path=TEMP_FOLDER)
+    bw.export_csv(DATA, file_name='export_pyarrow_engine', folder_path=TEMP_FOLDER, engine='pyarrow')
+
+    expected = pd.read_csv(os.path.join(TEMP_FOLDER, 'export_pandas_engine.csv'), index_col=0)
+    result = pd.read_csv(os.path.join(TEMP_FOLDER, 'export_pyarrow_engine.csv'), index_col=0)
+    expected.index = pd.to_datetime(expected.index)
+    result.index = pd.to_datetime(result.index)
+    pd.testing.assert_frame_equal(result, expected)
+
+    # kwargs the pyarrow writer cannot honour are rejected rather than silently dropped
+    with pytest.raises(ValueError):
+        bw.export_csv(DATA, file_name='export_pyarrow_engine.tab', folder_path=TEMP_FOLDER,
+                      sep='\t', engine='pyarrow')
+
+
 def test_calc_mean_speed_of_freq_tab():
     fig, freq_tab = bw.freq_table(DATA.Spd80mN, DATA.Dir38mS, return_data=True)
     assert round(bw.export.export._calc_mean_speed_of_freq_tab(freq_tab), 5) == 7.51925
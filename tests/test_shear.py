@@ -62,11 +62,14 @@ def test_by_sector():
     assert round(shear_by_sector_custom_bins.alpha.mean(), 4) == 0.1265
 
     # Test apply
-    shear_by_sector_power_law.apply(DATA['Spd80mN'], directions, 40, 60)
+    scaled_power_law = shear_by_sector_power_law.apply(DATA['Spd80mN'], directions, 40, 60)
     shear_by_sector_log_law.apply(DATA['Spd80mN'], directions, 40, 60)
-    shear_by_sector_custom_bins.apply(DATA['Spd80mN'], directions, 40, 60)
+    scaled_custom_bins = shear_by_sector_custom_bins.apply(DATA['Spd80mN'], directions, 40, 60)
 
-    assert True
+    assert len(scaled_power_law) == 80183
+    assert round(scaled_power_law.mean(), 6) == 7.927333
+    assert len(scaled_custom_bins) == 80183
+    assert round(scaled_custom_bins.mean(), 6) == 7.924334
 
 
 def test_time_of_day():